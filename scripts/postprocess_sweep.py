@@ -27,6 +27,19 @@ from read_scalars import read_scalars_from_dir
 PROJECT_ROOT = _SCRIPT_DIR.parent
 DEFAULT_SWEEP_ROOT = PROJECT_ROOT / "results" / "sweep"
 
+# trends.csv columns (also used by results_service.py)
+MANIFEST_COLS = ["experiment_id", "seed", "num_nodes", "packet_interval", "mac", "network", "output_dir"]
+OBS_COLS = [
+    "obs_total_generated", "obs_total_delivered", "obs_total_collisions",
+    "obs_total_tx_attempts", "obs_total_retries_exhausted",
+    "obs_max_e2e_delay_sec", "obs_mean_pdr",
+    "obs_collision_ratio", "obs_retry_exhaustion_ratio",
+]
+INTERP_COLS = [
+    "interpret_latency_high", "interpret_collision_dominated",
+    "interpret_retry_exhaustion_onset", "interpret_any_trend",
+]
+
 
 def load_yaml(path: Path) -> dict:
     try:
@@ -138,17 +151,9 @@ def main() -> None:
             rows.append(r)
 
     out_path = sweep_root / "trends.csv"
-    obs_cols = [
-        "obs_total_generated", "obs_total_delivered", "obs_total_collisions",
-        "obs_total_tx_attempts", "obs_total_retries_exhausted",
-        "obs_max_e2e_delay_sec", "obs_mean_pdr",
-        "obs_collision_ratio", "obs_retry_exhaustion_ratio",
-    ]
-    interp_cols = [
-        "interpret_latency_high", "interpret_collision_dominated",
-        "interpret_retry_exhaustion_onset", "interpret_any_trend",
-    ]
-    manifest_cols = ["experiment_id", "seed", "num_nodes", "packet_interval", "mac", "network", "output_dir"]
+    obs_cols = OBS_COLS
+    interp_cols = INTERP_COLS
+    manifest_cols = MANIFEST_COLS
 
     with open(out_path, "w", newline="", encoding="utf-8") as f:
         if not args.no_header_comment:
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Local results query service: load sweep roots once, answer filtered queries from memory.
+
+- Observations per run use the same aggregation as postprocess_sweep.py (obs_* columns).
+- Bounded LRU cache keyed by run directory. An entry is invalidated when the run's
+  result files (*.csv, *.sca) change on disk (added, removed, size or mtime changed).
+- Manifests are re-read when manifest.csv changes.
+- Binds to 127.0.0.1 only (HTTP/JSON). Reports query latency and cache hit rate.
+
+Usage:
+  From project root: python scripts/results_service.py [sweep_root ...] [--port 8765] [--cache-size N]
+  Default sweep_root: results/sweep
+
+Endpoints:
+  GET /query?mac=MacTDMA&num_nodes=8&packet_interval=0.05&metric=obs_mean_pdr
+  GET /stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+if str(_SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(_SCRIPT_DIR))
+from postprocess_sweep import MANIFEST_COLS, OBS_COLS, aggregate_scalars
+from read_scalars import read_scalars_from_dir
+
+PROJECT_ROOT = _SCRIPT_DIR.parent
+DEFAULT_SWEEP_ROOT = PROJECT_ROOT / "results" / "sweep"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 256
+HOST = "127.0.0.1"
+RESULT_SUFFIXES = (".csv", ".sca")
+
+
+class QueryError(ValueError):
+    """Invalid query parameters (reported to the client as HTTP 400)."""
+
+
+def run_fingerprint(run_dir: Path) -> tuple | None:
+    """(name, size, mtime_ns) for each result file in run_dir; None if the directory is missing."""
+    try:
+        paths = sorted(p for p in run_dir.iterdir() if p.suffix in RESULT_SUFFIXES)
+    except OSError:
+        return None
+    out = []
+    for p in paths:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        out.append((p.name, st.st_size, st.st_mtime_ns))
+    return tuple(out)
+
+
+class ObservationCache:
+    """Bounded LRU of per-run observations, validated against the run's file fingerprint."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.preloaded = 0
+
+    def get(self, run_dir: Path, count: bool = True) -> tuple[dict | None, str | None]:
+        """
+        (observations, error) for run_dir. Observations are None if the run has no scalars
+        or could not be read; error is the read failure, if any. Re-parses only on miss or change.
+        count=False (preload) keeps the lookup out of hits/misses so hit_rate reflects queries only.
+        """
+        key = str(run_dir)
+        fp = run_fingerprint(run_dir)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fp:
+                if count:
+                    self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+            if entry is not None:
+                self.invalidations += 1
+                del self._entries[key]
+            if count:
+                self.misses += 1
+            else:
+                self.preloaded += 1
+
+        # Parse outside the lock so slow directories do not block other queries
+        # A read failure is cached under the current fingerprint like any other result,
+        # so one broken run is reported once per change instead of failing every query.
+        error = None
+        try:
+            scalar_rows = read_scalars_from_dir(run_dir) if fp else []
+            obs = aggregate_scalars(scalar_rows) if scalar_rows else None
+        except (OSError, ValueError, csv.Error) as e:
+            obs, error = None, f"{type(e).__name__}: {e}"
+
+        with self._lock:
+            self._entries[key] = (fp, obs, error)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return obs, error
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else None,
+                "preloaded": self.preloaded,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+class SweepIndex:
+    """Manifest rows for one or more sweep roots; a manifest is re-read when it changes on disk."""
+
+    def __init__(self, sweep_roots: list[Path]):
+        self.sweep_roots = sweep_roots
+        self._manifests: dict[Path, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, sweep_root: Path) -> list[dict]:
+        manifest_path = sweep_root / "manifest.csv"
+        with self._lock:
+            cached = self._manifests.get(sweep_root)
+        previous = cached[1] if cached is not None else []
+        try:
+            st = manifest_path.stat()
+        except OSError:
+            return previous
+        # (mtime, size): run_sweep.py rewrites the manifest in place, so size catches a
+        # rewrite that lands within the same mtime tick
+        sig = (st.st_mtime_ns, st.st_size)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        rows = []
+        try:
+            with open(manifest_path, newline="", encoding="utf-8") as f:
+                for m in csv.DictReader(f):
+                    out_dir = m.get("output_dir", "")
+                    if not out_dir:
+                        continue
+                    path = Path(out_dir)
+                    if not path.is_absolute():
+                        path = PROJECT_ROOT / path
+                    row = {k: m.get(k, "") for k in MANIFEST_COLS}
+                    row["sweep_root"] = str(sweep_root)
+                    row["_path"] = path
+                    rows.append(row)
+            st = manifest_path.stat()
+        except (OSError, ValueError, csv.Error):
+            return previous
+        if (st.st_mtime_ns, st.st_size) != sig:
+            # Manifest changed while reading (e.g. mid-write): do not cache a possibly truncated list
+            return previous if cached is not None else rows
+        with self._lock:
+            self._manifests[sweep_root] = (sig, rows)
+        return rows
+
+    def runs(self) -> list[dict]:
+        out = []
+        for root in self.sweep_roots:
+            out.extend(self._load(root))
+        return out
+
+
+def _match(row: dict, mac: str | None, num_nodes: int | None, packet_interval: float | None) -> bool:
+    if mac is not None and row.get("mac", "") != mac:
+        return False
+    try:
+        if num_nodes is not None and int(row.get("num_nodes", "")) != num_nodes:
+            return False
+        if packet_interval is not None and not math.isclose(float(row.get("packet_interval", "")), packet_interval):
+            return False
+    except ValueError:
+        return False
+    return True
+
+
+class ResultsService:
+    """Query layer: manifest filter + cached observations + latency bookkeeping."""
+
+    def __init__(self, sweep_roots: list[Path], cache_size: int | None = None):
+        self.index = SweepIndex(sweep_roots)
+        # Default: hold every run known at startup, so full scans never evict what they need next
+        if cache_size is None:
+            cache_size = max(DEFAULT_CACHE_SIZE, len(self.index.runs()))
+        self.cache = ObservationCache(cache_size)
+        self._lock = threading.Lock()
+        self.query_count = 0
+        self.latency_total_sec = 0.0
+        self.latency_max_sec = 0.0
+
+    @staticmethod
+    def parse_query(params: dict[str, list[str]]) -> dict:
+        """Validate query parameters. Raises QueryError on bad input; touches no files."""
+        mac = params["mac"][0] if params.get("mac") else None
+        try:
+            num_nodes = int(params["num_nodes"][0]) if params.get("num_nodes") else None
+        except ValueError:
+            raise QueryError(f"num_nodes must be an integer, got {params['num_nodes'][0]!r}") from None
+        try:
+            packet_interval = float(params["packet_interval"][0]) if params.get("packet_interval") else None
+        except ValueError:
+            raise QueryError(f"packet_interval must be a number, got {params['packet_interval'][0]!r}") from None
+        metrics = [m for v in params.get("metric", []) for m in v.split(",") if m]
+        unknown = [m for m in metrics if m not in OBS_COLS]
+        if unknown:
+            raise QueryError(f"Unknown metric(s): {', '.join(unknown)}; expected one of {', '.join(OBS_COLS)}")
+        return {"mac": mac, "num_nodes": num_nodes, "packet_interval": packet_interval, "metrics": metrics}
+
+    def query(self, q: dict) -> dict:
+        """Filter runs by mac, num_nodes, packet_interval; restrict observations to metric(s). q from parse_query."""
+        start = time.perf_counter()
+        mac, num_nodes, packet_interval, metrics = q["mac"], q["num_nodes"], q["packet_interval"], q["metrics"]
+
+        results = []
+        for row in self.index.runs():
+            if not _match(row, mac, num_nodes, packet_interval):
+                continue
+            obs, error = self.cache.get(row["_path"])
+            out = {k: v for k, v in row.items() if not k.startswith("_")}
+            if obs is None:
+                out["observations"] = None
+            else:
+                out["observations"] = {k: obs.get(k) for k in (metrics or OBS_COLS)}
+            if error is not None:
+                out["error"] = error
+            results.append(out)
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.query_count += 1
+            self.latency_total_sec += elapsed
+            self.latency_max_sec = max(self.latency_max_sec, elapsed)
+        return {"count": len(results), "latency_ms": elapsed * 1000.0, "results": results}
+
+    def preload(self) -> int:
+        """Parse every run once so the first queries are served from cache. Returns run count."""
+        rows = self.index.runs()
+        for row in rows:
+            self.cache.get(row["_path"], count=False)
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self.query_count
+            latency = {
+                "queries": n,
+                "mean_ms": (self.latency_total_sec / n * 1000.0) if n else None,
+                "max_ms": self.latency_max_sec * 1000.0 if n else None,
+            }
+        return {
+            "sweep_roots": [str(p) for p in self.index.sweep_roots],
+            "query_latency": latency,
+            "cache": self.cache.stats(),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ResultsService/1.0"
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        service: ResultsService = self.server.service
+        url = urlparse(self.path)
+        try:
+            if url.path == "/query":
+                try:
+                    q = service.parse_query(parse_qs(url.query))
+                except QueryError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                self._send_json(200, service.query(q))
+            elif url.path == "/stats":
+                self._send_json(200, service.stats())
+            else:
+                self._send_json(404, {"error": f"Unknown path: {url.path}; use /query or /stats"})
+        except Exception as e:
+            self.log_error("Internal error on %s: %r", self.path, e)
+            self._send_json(500, {"error": f"Internal error: {type(e).__name__}: {e}"})
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def log_error(self, format: str, *args) -> None:
+        # Errors are logged even with --quiet
+        super().log_message(format, *args)
+
+
+def make_server(service: ResultsService, port: int = DEFAULT_PORT, quiet: bool = False) -> ThreadingHTTPServer:
+    """HTTP server bound to localhost only."""
+    httpd = ThreadingHTTPServer((HOST, port), _Handler)
+    httpd.service = service
+    httpd.quiet = quiet
+    return httpd
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Local results query service (localhost HTTP/JSON, in-memory cache).")
+    ap.add_argument("sweep_roots", nargs="*", help="Sweep results root(s) (default: results/sweep)")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port on {HOST} (default: {DEFAULT_PORT})")
+    ap.add_argument("--cache-size", type=int, default=None,
+                    help=f"Max cached runs (default: max({DEFAULT_CACHE_SIZE}, number of runs in the manifests))")
+    ap.add_argument("--no-preload", action="store_true", help="Do not parse all runs at startup")
+    ap.add_argument("--quiet", action="store_true", help="Do not log each request")
+    args = ap.parse_args()
+
+    sweep_roots = []
+    for s in args.sweep_roots or [str(DEFAULT_SWEEP_ROOT)]:
+        p = Path(s)
+        if not p.is_absolute():
+            p = PROJECT_ROOT / p
+        if not (p / "manifest.csv").exists():
+            print(f"Manifest not found: {p / 'manifest.csv'}", file=sys.stderr)
+            sys.exit(1)
+        sweep_roots.append(p)
+
+    service = ResultsService(sweep_roots, cache_size=args.cache_size)
+    n_runs = len(service.index.runs())
+    if n_runs > service.cache.max_entries:
+        print(
+            f"Warning: {n_runs} runs exceed --cache-size {service.cache.max_entries}; "
+            "full scans will re-parse runs on every query",
+            file=sys.stderr,
+        )
+    if not args.no_preload:
+        start = time.perf_counter()
+        n = service.preload()
+        print(
+            f"Loaded {n} runs in {(time.perf_counter() - start) * 1000.0:.1f} ms "
+            f"({min(n, service.cache.max_entries)} cached, cache size {service.cache.max_entries})"
+        )
+
+    httpd = make_server(service, port=args.port, quiet=args.quiet)
+    print(f"Serving on http://{HOST}:{args.port} (/query, /stats); Ctrl+C to stop")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()